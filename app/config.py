@@ -75,9 +75,25 @@ SHOOT_ANGLE: int = 3
 PLATFORM_BG: str = '#8888AA'
 PLATFORM_HEIGHT: int = 15
 
+# Distance to wake sleeping objects from projectiles and players
+WAKE_DISTANCE: int = 20
+
 UPS: int = 240
 UPDATES_PER_FRAME: int = 4
 
+# Match recording. Set CAPTURE_DIR to directory path to record frames there.
+# CAPTURE_FORMAT is 'raw', 'png' or 'zlib' (zlib-compressed raw RGB frames)
+CAPTURE_DIR: str = None
+CAPTURE_FORMAT: str = 'png'
+CAPTURE_BUFFERS: int = 8
+CAPTURE_WORKERS: int = 2
+
+# Match telemetry. Set TELEMETRY_FILE to file path to write game events there
+# as gzip-compressed JSON lines. TELEMETRY_BUFFER is ring size in events
+TELEMETRY_FILE: str = None
+TELEMETRY_BUFFER: int = 4096
+TELEMETRY_FLUSH_INTERVAL: float = 1.0
+
 MAP_FILE: str = "./maps/default.map"
 MAP_CELL: Vector2 = Vector2(150, 80)
 
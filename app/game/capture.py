@@ -0,0 +1,182 @@
+import logging
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue, Empty
+from threading import Lock
+
+import pygame as pg
+
+logger = logging.getLogger(__name__)
+
+# Frame file extension by capture format
+FRAME_EXTENSIONS: dict[str, str] = {
+    'raw': 'rgb',
+    'png': 'png',
+    'zlib': 'rgb.z'
+}
+
+# Frame buffers pixel masks to keep pixels as R, G, B bytes
+RGB_MASKS: (int, int, int, int) = (0x0000FF, 0x00FF00, 0xFF0000, 0)
+
+PNG_SIGNATURE: bytes = b'\x89PNG\r\n\x1a\n'
+
+
+def png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    """
+    Build PNG chunk of given type
+    """
+    return (struct.pack('>I', len(data)) + chunk_type + data
+            + struct.pack('>I', zlib.crc32(data, zlib.crc32(chunk_type))))
+
+
+def write_png(path: str, pixels: memoryview,
+              width: int, height: int, pitch: int):
+    """
+    Write RGB pixels rows as PNG image.
+    Uses zlib only, which releases GIL while compressing,
+    so game loop is not blocked by writers.
+    """
+    compressor = zlib.compressobj(1)
+    chunks: list[bytes] = []
+    row_size: int = width * 3
+    for row in range(0, height * pitch, pitch):
+        # Every row starts with filter type, 0 is for no filter
+        chunks.append(compressor.compress(b'\x00'))
+        chunks.append(compressor.compress(pixels[row:row + row_size]))
+    chunks.append(compressor.flush())
+
+    with open(path, 'wb') as png_file:
+        png_file.write(PNG_SIGNATURE)
+        png_file.write(png_chunk(
+            b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+        ))
+        png_file.write(png_chunk(b'IDAT', b''.join(chunks)))
+        png_file.write(png_chunk(b'IEND', b''))
+
+
+class FrameRecorder(object):
+    """
+    Match recorder.
+    Copies frames into preallocated ring of frame buffers
+    and writes them to disk on background threads.
+    Drops frames instead of blocking game loop
+    when writers fall behind.
+
+    Frames are RGB, 3 bytes per pixel, rows from top to bottom.
+    'raw' frames are just pixels, 'zlib' frames are compressed pixels.
+    """
+
+    def __init__(self,
+                 surface: pg.Surface,
+                 directory: str,
+                 frame_format: str,
+                 n_buffers: int,
+                 n_workers: int):
+        """
+        Initialize FrameRecorder by surface to record, output directory,
+        frame format ('raw', 'png' or 'zlib'),
+        number of frame buffers and number of writer threads
+        """
+        if frame_format not in FRAME_EXTENSIONS:
+            raise ValueError(f"Unknown capture format: {frame_format}")
+
+        self.directory: str = directory
+        self.frame_format: str = frame_format
+
+        os.makedirs(directory, exist_ok=True)
+
+        # Preallocate ring of RGB frame buffers,
+        # so capturing frame is a single blit
+        self.size: (int, int) = surface.get_size()
+        self.buffers: list[pg.Surface] = [
+            pg.Surface(self.size, 0, 24, RGB_MASKS)
+            for i in range(n_buffers)
+        ]
+
+        # Track numbers of buffers not used by writers
+        self.free_buffers: Queue = Queue()
+        for i in range(n_buffers):
+            self.free_buffers.put(i)
+
+        self.writers: ThreadPoolExecutor = ThreadPoolExecutor(
+            n_workers, thread_name_prefix='frame-writer'
+        )
+
+        # Count frames to name files
+        # and to know how many were dropped or failed to be written
+        self.n_frames: int = 0
+        self.n_dropped: int = 0
+        self.n_failed: int = 0
+        # Writers count failures concurrently
+        self.n_failed_lock: Lock = Lock()
+
+    def capture(self, surface: pg.Surface):
+        """
+        Capture surface as next frame or drop it if no buffer is free
+        """
+        number: int = self.n_frames
+        self.n_frames += 1
+
+        try:
+            buffer_number: int = self.free_buffers.get_nowait()
+        except Empty:
+            self.n_dropped += 1
+            return
+
+        self.buffers[buffer_number].blit(surface, (0, 0))
+
+        self.writers.submit(self.write_frame, buffer_number, number)
+
+    def write_frame(self, buffer_number: int, number: int):
+        """
+        Write frame from buffer to file and release buffer
+        """
+        path: str = os.path.join(
+            self.directory,
+            f"frame_{number:06d}.{FRAME_EXTENSIONS[self.frame_format]}"
+        )
+        buffer: pg.Surface = self.buffers[buffer_number]
+        width, height = self.size
+        pitch: int = buffer.get_pitch()
+
+        try:
+            # Read pixels through buffer view without copying them.
+            # The view locks buffer, so it must be released
+            # before buffer is given back to game loop
+            with memoryview(buffer.get_buffer()) as pixels:
+                if self.frame_format == 'png':
+                    write_png(path, pixels, width, height, pitch)
+                else:
+                    self.write_pixels(path, pixels, width, height, pitch)
+        except Exception:
+            # Writer thread exceptions would be lost in futures
+            with self.n_failed_lock:
+                self.n_failed += 1
+            logger.exception("Failed to write frame %d", number)
+        finally:
+            self.free_buffers.put(buffer_number)
+
+    def write_pixels(self, path: str, pixels: memoryview,
+                     width: int, height: int, pitch: int):
+        """
+        Write RGB pixels rows as raw or zlib-compressed frame
+        """
+        data: (memoryview, bytes) = pixels
+        # Cut padding bytes at rows ends, if there are any
+        if pitch != width * 3:
+            data = b''.join(
+                pixels[row:row + width * 3]
+                for row in range(0, height * pitch, pitch)
+            )
+        if self.frame_format == 'zlib':
+            data = zlib.compress(data, 1)
+        with open(path, 'wb') as frame_file:
+            frame_file.write(data)
+
+    def close(self):
+        """
+        Wait for queued frames to be written and stop writers
+        """
+        self.writers.shutdown(wait=True)
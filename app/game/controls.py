@@ -0,0 +1,79 @@
+from typing import Callable, Sequence
+
+import pygame as pg
+
+# Control bits of player's controls bitmask
+RIGHT = 1 << 0
+LEFT = 1 << 1
+JUMP = 1 << 2
+SHOOT = 1 << 3
+BOMB = 1 << 4
+
+CONTROLS: dict[str, int] = {
+    'RIGHT': RIGHT,
+    'LEFT': LEFT,
+    'JUMP': JUMP,
+    'SHOOT': SHOOT,
+    'BOMB': BOMB
+}
+
+
+class KeyboardInput(object):
+    """
+    Input source reading players' controls from keyboard
+    """
+
+    def __init__(self, shortcuts: list[dict[str, int]]):
+        """
+        Initialize KeyboardInput by shortcuts of every player
+        """
+        # Flatten shortcuts to (player number, key, control bit) bindings
+        self.bindings: list[(int, int, int)] = [
+            (number, key, CONTROLS[control])
+            for number, player_shortcuts in enumerate(shortcuts)
+            for control, key in player_shortcuts.items()
+        ]
+
+    def sample(self, controls: list[int]):
+        """
+        Fill controls bitmask of every player from keyboard state
+        """
+        pressed = pg.key.get_pressed()
+
+        for number in range(len(controls)):
+            controls[number] = 0
+
+        for number, key, bit in self.bindings:
+            if pressed[key]:
+                controls[number] |= bit
+
+
+class ScriptedInput(object):
+    """
+    Input source for headless and bot-driven matches.
+    Takes controls bitmasks of all players from script by tick number,
+    script must give exactly one bitmask per player.
+    """
+
+    def __init__(self, script: Callable[[int], Sequence[int]]):
+        """
+        Initialize ScriptedInput by script function
+        """
+        self.script: Callable[[int], Sequence[int]] = script
+        self.tick: int = 0
+
+    def sample(self, controls: list[int]):
+        """
+        Fill controls bitmask of every player from script
+        """
+        script_controls: Sequence[int] = self.script(self.tick)
+        if len(script_controls) != len(controls):
+            raise ValueError(
+                f"Script gave controls of {len(script_controls)} players "
+                f"instead of {len(controls)}"
+            )
+
+        # Keep controls list, because game and players share it
+        for number, player_controls in enumerate(script_controls):
+            controls[number] = player_controls
+        self.tick += 1
@@ -2,17 +2,23 @@ import pygame as pg
 from pygame.math import Vector2
 
 from app import config
+from app.game.capture import FrameRecorder
+from app.game.controls import KeyboardInput
+from app.game.telemetry import Telemetry, MATCH_END, NO_PLAYER
 from app.game.objects import Player
 from app.utils.maps import import_map
 
 
 class Game(object):
-    def __init__(self):
+    def __init__(self, input_source: "Input source object" = None):
         """
-        Initialize Game object
+        Initialize Game object.
+        Players' controls are read from keyboard
+        unless other input source is given.
         """
-        # Set self.is_pending_quit
+        # Set self.is_pending_quit and self.is_match_over
         self.is_pending_quit = False
+        self.is_match_over = False
 
         # Initialize pygame and its window
         pg.init()
@@ -28,26 +34,69 @@ class Game(object):
 
         self.surface.blit(self.bg, (0, 0))
 
+        # Initialize match recorder if capture is enabled
+        self.recorder: "FrameRecorder object" = None
+        if config.CAPTURE_DIR is not None:
+            self.recorder = FrameRecorder(self.surface,
+                                          config.CAPTURE_DIR,
+                                          config.CAPTURE_FORMAT,
+                                          config.CAPTURE_BUFFERS,
+                                          config.CAPTURE_WORKERS)
+
+        # Initialize match telemetry if enabled
+        self.telemetry: Telemetry = None
+        if config.TELEMETRY_FILE is not None:
+            self.telemetry = Telemetry(config.TELEMETRY_FILE,
+                                       config.TELEMETRY_BUFFER,
+                                       config.TELEMETRY_FLUSH_INTERVAL)
+
         # Initialize sprite groups
         self.material_objects: pg.sprite.Group = pg.sprite.Group()
+        self.awake_objects: pg.sprite.Group = pg.sprite.Group()
+        self.sleeping_objects: pg.sprite.Group = pg.sprite.Group()
         self.players: pg.sprite.Group = pg.sprite.Group()
-        self.platforms: pg.sprite.Group = pg.sprite.Group(
-            *import_map()
-        )
+        self.platforms: pg.sprite.Group = pg.sprite.Group()
+        # Iterating group copies its sprites list,
+        # so physics iterates platforms tuple instead.
+        # Both are changed only by self.set_platforms
+        self.platforms_tuple: tuple = ()
+        self.set_platforms(import_map())
+
+        # Initialize input source and controls bitmask of every player
+        players_config: list[dict] = config.PLAYERS[:config.N_PLAYERS]
+        if input_source is None:
+            input_source = KeyboardInput(
+                [player['SHORTCUTS'] for player in players_config]
+            )
+        self.input_source: "Input source object" = input_source
+        self.controls: list[int] = [0] * len(players_config)
 
         # Initialize players
-        for player in config.PLAYERS[:config.N_PLAYERS]:
+        for number, player in enumerate(players_config):
             Player(
                 self,
                 player['POSITION'],
                 player['COLOR'],
-                player['SHORTCUTS']
+                number
             )
 
     def run(self) -> int:
         """
         Run game loop
         """
+        try:
+            return self.loop()
+        finally:
+            # Write frames and events left in buffers
+            if self.recorder is not None:
+                self.recorder.close()
+            if self.telemetry is not None:
+                self.telemetry.close()
+
+    def loop(self) -> int:
+        """
+        Run main loop until quit
+        """
         # Create clock object
         clock = pg.time.Clock()
 
@@ -68,6 +117,9 @@ class Game(object):
             if self.is_pending_quit and pg.key.get_pressed()[pg.K_ESCAPE]:
                 return 0
 
+            # Sample controls of all players once per tick
+            self.input_source.sample(self.controls)
+
             if len(self.players) > 1:
                 self.update()
 
@@ -82,9 +134,55 @@ class Game(object):
 
     def update(self):
         """
-        Update all game objects
+        Update all awake game objects
         """
-        self.material_objects.update()
+        # Wake sleeping players whose controls are pressed
+        for player in self.players:
+            if player.is_sleeping and player.has_input():
+                player.wake()
+                # Player fell asleep on land, so handle controls
+                # as on that tick. Otherwise first tick moves player
+                # less than a pixel off the land and jump is ignored
+                player.handle_controls()
+
+        for material_object in self.awake_objects.sprites():
+            material_object.update()
+            material_object.try_sleep()
+
+        if len(self.players) <= 1 and not self.is_match_over:
+            self.end_match()
+
+    def end_match(self):
+        """
+        Mark match as over and emit its end with winner if there is one
+        """
+        self.is_match_over = True
+
+        if self.telemetry is not None:
+            winner = NO_PLAYER
+            if len(self.players) == 1:
+                winner = list(self.players)[0].number
+            self.telemetry.emit(MATCH_END, winner)
+
+    def set_platforms(self, platforms):
+        """
+        Replace all game platforms and wake all sleeping objects.
+        Change platforms only here to keep self.platforms_tuple
+        in sync with self.platforms
+        """
+        self.platforms.empty()
+        self.platforms.add(*platforms)
+        self.platforms_tuple = tuple(self.platforms)
+
+        # Sleeping objects may have lost their land
+        self.wake_all()
+
+    def wake_all(self):
+        """
+        Wake all sleeping objects
+        """
+        for material_object in self.sleeping_objects.sprites():
+            material_object.wake()
 
     def produce_frame(self):
         # Draw background
@@ -105,5 +203,8 @@ class Game(object):
                            (config.GAME_SIZE / 2), 200)
             self.is_pending_quit = True
 
+        if self.recorder is not None:
+            self.recorder.capture(self.surface)
+
         # Flip display
         pg.display.flip()
@@ -7,7 +7,8 @@ from random import random
 from enum import Enum, auto
 
 from app import config
-from app.utils.functions import distance, sign, collide_rect
+from app.game import controls, telemetry
+from app.utils.functions import distance, sign
 from app.game.sprite import VectoredSprite
 
 # Directions
@@ -24,9 +25,15 @@ class CollideDirection(Enum):
     RIGHT = auto()
     CENTER = auto()
 
-# Coordinates
-X = 0
-Y = 1
+# Explosion particles offset (in object sizes), first angle and angle range
+# by collide direction
+BOOM_SCATTER = {
+    CollideDirection.TOP: ((0, 1), pi, pi),
+    CollideDirection.BOTTOM: ((0, -1), 0, pi),
+    CollideDirection.RIGHT: ((-1, 0), pi / 2, pi),
+    CollideDirection.LEFT: ((1, 0), -pi / 2, pi),
+    None: ((0, 0), 0, 2 * pi),
+}
 
 class MaterialObject(VectoredSprite):
     """
@@ -44,7 +51,9 @@ class MaterialObject(VectoredSprite):
         """
         Initialize sprite
         """
-        super().__init__(pos, size, game.material_objects, *groups)
+        super().__init__(pos, size,
+                         game.material_objects, game.awake_objects,
+                         *groups)
 
         # Save game object
         self.game: "Game object" = game
@@ -65,6 +74,11 @@ class MaterialObject(VectoredSprite):
         # Initialize some fields used by child classes
         self.on_edge: bool = False
 
+        # Preallocate scratch state reused by every update
+        self._new_pos: Vector2 = Vector2(0, 0)
+        self._new_rect: pg.Rect = pg.Rect(0, 0, 0, 0)
+        self._old_rect: pg.Rect = pg.Rect(0, 0, 0, 0)
+
     def update_dt(self):
         """
         Update delta-time to apply tick
@@ -77,30 +91,34 @@ class MaterialObject(VectoredSprite):
         """
         Update sprite
         """
-        super().update()
-
+        # pg.sprite.Sprite.update does nothing, so it is not called:
+        # even super() would allocate on every update
         self.update_dt()
 
+        dt: float = self.dt
+        pos: Vector2 = self.pos
+        size: Vector2 = self.size
+
         # Initialize variables to look if X or Y delta can be applied
         x_can_move: bool = True
         y_can_move: bool = True
 
         has_collision = False
 
-        # Apply speed and gravity
-        new_pos: Vector2 = Vector2(self.pos)
-        new_speed: Vector2 = Vector2(self.speed)
-
-        new_pos += self.speed * self.dt
+        # Apply speed and gravity in place
+        new_pos: Vector2 = self._new_pos
+        new_pos.x = pos.x + self.speed.x * dt
+        new_pos.y = pos.y + self.speed.y * dt
 
-        new_speed.y += self.gravity * self.dt
-        new_pos.y += (self.gravity * self.dt ** 2) / 2
+        new_speed_x: float = self.speed.x
+        new_speed_y: float = self.speed.y + self.gravity * dt
+        new_pos.y += (self.gravity * dt ** 2) / 2
 
         # Collide with edges
 
         # Floor
-        if new_pos.y + self.size.y > config.GAME_SIZE.y:
-            new_pos.y = config.GAME_SIZE.y - self.size.y
+        if new_pos.y + size.y > config.GAME_SIZE.y:
+            new_pos.y = config.GAME_SIZE.y - size.y
             self.on_edge = True
             y_can_move = False
             has_collision = True
@@ -113,8 +131,8 @@ class MaterialObject(VectoredSprite):
             has_collision = True
 
         # Right
-        if new_pos.x + self.size.x > config.GAME_SIZE.x:
-            new_pos.x = config.GAME_SIZE.x - self.size.x
+        if new_pos.x + size.x > config.GAME_SIZE.x:
+            new_pos.x = config.GAME_SIZE.x - size.x
             self.on_edge = True
             x_can_move = False
             has_collision = True
@@ -126,37 +144,54 @@ class MaterialObject(VectoredSprite):
             x_can_move = False
             has_collision = True
 
-        movement_direction: (int, int) = (
-            sign(new_pos.x - self.pos.x),
-            sign(new_pos.y - self.pos.y)
-        )
+        x_direction: int = sign(new_pos.x - pos.x)
+        y_direction: int = sign(new_pos.y - pos.y)
 
         # Platforms
 
-        for platform in self.game.platforms:
-            new_x_collide, new_y_collide = collide_rect(platform.rect, pg.sprite.Rect(*new_pos, *self.size))
-            old_x_collide, old_y_collide = collide_rect(platform.rect, pg.sprite.Rect(*self.pos, *self.size))
-            if not (new_x_collide and new_y_collide):
+        new_rect: pg.Rect = self._new_rect
+        new_rect.update(new_pos.x, new_pos.y, size.x, size.y)
+        old_rect: pg.Rect = self._old_rect
+        old_rect.update(pos.x, pos.y, size.x, size.y)
+
+        # Walk platforms by index: for loop would allocate tuple iterator
+        # on every update, and tests/test_physics.py requires no allocations.
+        # Game.set_platforms keeps platforms_tuple in sync with platforms
+        platforms: tuple = self.game.platforms_tuple
+        n_platforms: int = len(platforms)
+        platform_number: int = 0
+        while platform_number < n_platforms:
+            platform = platforms[platform_number]
+            platform_number += 1
+
+            platform_rect: pg.Rect = platform.rect
+            if not new_rect.colliderect(platform_rect):
                 continue
 
+            old_x_collide: bool = (old_rect.left < platform_rect.right
+                                   and old_rect.right > platform_rect.left)
+            old_y_collide: bool = (old_rect.top < platform_rect.bottom
+                                   and old_rect.bottom > platform_rect.top)
+
             has_collision = True
 
-            if movement_direction[X] == LEFT:
-                if old_y_collide:
+            if old_y_collide:
+                if x_direction == LEFT:
                     x_can_move = False
-                    self.pos.x = platform.pos.x + platform.size.x
-            if movement_direction[X] == RIGHT:
-                if old_y_collide:
+                    pos.x = platform.pos.x + platform.size.x
+                elif x_direction == RIGHT:
                     x_can_move = False
-                    self.pos.x = platform.pos.x - self.size.x
-            if movement_direction[Y] == DOWN:
-                if old_x_collide:
+                    pos.x = platform.pos.x - size.x
+            if old_x_collide:
+                if y_direction == DOWN:
                     y_can_move = False
-                    self.pos.y = platform.pos.y - self.size.y
-            if movement_direction[Y] == UP:
-                if old_x_collide:
+                    pos.y = platform.pos.y - size.y
+                elif y_direction == UP:
                     y_can_move = False
-                    self.pos.y = platform.pos.y + platform.size.y
+                    pos.y = platform.pos.y + platform.size.y
+
+            # Position may be snapped to the platform, so refresh old rect
+            old_rect.update(pos.x, pos.y, size.x, size.y)
 
             self.on_collide()
 
@@ -164,23 +199,23 @@ class MaterialObject(VectoredSprite):
         if not x_can_move:
             self.speed.x = 0
         else:
-            self.speed.x = new_speed.x
-            self.pos.x = new_pos.x
+            self.speed.x = new_speed_x
+            pos.x = new_pos.x
 
         if not y_can_move:
             self.speed.y = 0
         else:
-            self.speed.y = new_speed.y
-            self.pos.y = new_pos.y
-
-        if not y_can_move and movement_direction[Y] == DOWN:
-            self.collide_direction = CollideDirection.BOTTOM
-        elif not y_can_move and movement_direction[Y] == UP:
-            self.collide_direction = CollideDirection.TOP
-        elif not x_can_move and movement_direction[X] == RIGHT:
-            self.collide_direction = CollideDirection.RIGHT
-        elif not x_can_move and movement_direction[X] == LEFT:
-            self.collide_direction = CollideDirection.LEFT
+            self.speed.y = new_speed_y
+            pos.y = new_pos.y
+
+        if not y_can_move and y_direction:
+            self.collide_direction = (CollideDirection.BOTTOM
+                                      if y_direction == DOWN else
+                                      CollideDirection.TOP)
+        elif not x_can_move and x_direction:
+            self.collide_direction = (CollideDirection.RIGHT
+                                      if x_direction == RIGHT else
+                                      CollideDirection.LEFT)
         elif not has_collision:
             self.collide_direction = None
 
@@ -192,6 +227,49 @@ class MaterialObject(VectoredSprite):
     def on_land(self):
         return self.collide_direction == CollideDirection.BOTTOM
 
+    @property
+    def is_resting(self) -> bool:
+        """
+        Whether object lies on a platform or an edge without moving
+        """
+        return self.on_land and self.speed.x == 0 and self.speed.y == 0
+
+    @property
+    def is_sleeping(self) -> bool:
+        return self.game.sleeping_objects.has(self)
+
+    def try_sleep(self):
+        """
+        Fall asleep if object is resting, so game stops updating it
+        """
+        if self.alive() and self.is_resting:
+            self.remove(self.game.awake_objects)
+            self.add(self.game.sleeping_objects)
+
+    def wake(self):
+        """
+        Make sleeping object updated by game again
+        """
+        self.remove(self.game.sleeping_objects)
+        self.add(self.game.awake_objects)
+
+        # Do not apply the whole sleeping time as a single tick,
+        # but still make a regular tick to keep trajectories
+        self.last_tick = time() - 1 / config.UPS
+
+    def wake_nearby(self):
+        """
+        Wake sleeping objects near this one
+        """
+        if not self.game.sleeping_objects:
+            return
+
+        area: pg.Rect = self.rect.inflate(config.WAKE_DISTANCE * 2,
+                                          config.WAKE_DISTANCE * 2)
+        for sleeping_object in self.game.sleeping_objects.sprites():
+            if area.colliderect(sleeping_object.rect):
+                sleeping_object.wake()
+
     def on_collide(self):
         pass
 
@@ -205,7 +283,7 @@ class Player(MaterialObject):
                  game: "Game object",
                  pos: Vector2,
                  color: (int, int, int),
-                 shortcuts: dict[str, int]):
+                 number: int):
         """
         Initialize Player sprite
         """
@@ -222,8 +300,8 @@ class Player(MaterialObject):
         # Set default direction
         self.direction = RIGHT
 
-        # Save shortcuts
-        self.shortcuts = shortcuts
+        # Save player number to find its controls in game controls
+        self.number: int = number
 
         # Initialize shoot timeout mechanizm
         self.shoot_from_time = 0
@@ -236,17 +314,26 @@ class Player(MaterialObject):
         """
         super().update()
         self.handle_controls()
+        self.wake_nearby()
+
+    def has_input(self) -> bool:
+        """
+        Whether any of player controls is pressed
+        """
+        return self.game.controls[self.number] != 0
 
     def handle_controls(self):
         """
         Handle player controls
         """
-        pressed = pg.key.get_pressed()
-        if pressed[self.shortcuts['JUMP']] and self.on_land:
+        pressed: int = self.game.controls[self.number]
+        if pressed & controls.JUMP and self.on_land:
             self.speed.y = config.PLAYER_JUMP * UP
-        if pressed[self.shortcuts['RIGHT']] and not pressed[self.shortcuts['LEFT']]:
+
+        moving: int = pressed & (controls.RIGHT | controls.LEFT)
+        if moving == controls.RIGHT:
             self.speed.x = config.PLAYER_SPEED * RIGHT
-        if not pressed[self.shortcuts['RIGHT']] and pressed[self.shortcuts['LEFT']]:
+        elif moving == controls.LEFT:
             self.speed.x = config.PLAYER_SPEED * LEFT
 
         # Calculate direction
@@ -255,10 +342,10 @@ class Player(MaterialObject):
         elif self.speed.x < 0:
             self.direction = LEFT
 
-        if pressed[self.shortcuts['SHOOT']]:
+        if pressed & controls.SHOOT:
             self.shoot()
 
-        if pressed[self.shortcuts['BOMB']]:
+        if pressed & controls.BOMB:
             self.launch_rocket()
 
     def shoot(self):
@@ -275,6 +362,10 @@ class Player(MaterialObject):
             self
         ))
 
+        if self.game.telemetry is not None:
+            self.game.telemetry.emit(telemetry.SHOT, self.number,
+                                     x=self.pos.x, y=self.pos.y)
+
     def launch_rocket(self):
         if not self.shoot_from_time <= time():
             return
@@ -285,6 +376,10 @@ class Player(MaterialObject):
             self
         ))
 
+        if self.game.telemetry is not None:
+            self.game.telemetry.emit(telemetry.ROCKET, self.number,
+                                     x=self.pos.x, y=self.pos.y)
+
     def kill(self):
         super().kill()
         while self.bombs:
@@ -327,6 +422,8 @@ class Projectile(MaterialObject):
         if self.on_land:
             self.when_on_land()
 
+        self.wake_nearby()
+
         for player in pg.sprite.spritecollide(self, self.game.players, False):
             self.on_collide_player(player)
 
@@ -344,34 +441,38 @@ class Projectile(MaterialObject):
 
     def on_collide_player(self, player: Player):
         if self.is_killing and player != self.shooter:
+            # Emit kill before victim's bombs explode
+            if self.game.telemetry is not None:
+                self.game.telemetry.emit(telemetry.KILL,
+                                         self.shooter.number, player.number,
+                                         player.pos.x, player.pos.y)
+
             player.kill()
 
 
 class Bomb(Projectile):
     def boom(self):
+        # Player.kill booms every bomb player ever launched,
+        # so do not emit explosions of bombs which have already exploded
+        is_exploded: bool = not self.alive()
         super().kill()
+
+        if self.game.telemetry is not None and not is_exploded:
+            self.game.telemetry.emit(telemetry.EXPLOSION, self.shooter.number,
+                                     x=self.pos.x, y=self.pos.y)
+
+        # Offset and scatter sector depend only on collide direction,
+        # so resolve them once for all particles
+        (offset_x, offset_y), angle_from, angle_range = BOOM_SCATTER.get(
+            self.collide_direction, BOOM_SCATTER[None]
+        )
+        pos_x: float = self.pos.x + self.size.x * offset_x
+        pos_y: float = self.pos.y + self.size.y * offset_y
+
         for i in range(config.N_PARTICLES):
             FireParticle(self.game,
-                         self.pos + (
-                            Vector2(0, self.size.y)
-                                if self.collide_direction == CollideDirection.TOP else
-                            Vector2(0, -self.size.y)
-                                if self.collide_direction == CollideDirection.BOTTOM else
-                            Vector2(-self.size.x, 0)
-                                if self.collide_direction == CollideDirection.RIGHT else
-                            Vector2(self.size.x, 0)
-                                if self.collide_direction == CollideDirection.LEFT else
-                            Vector2(0)
-                         ),
-                         random() * pi
-                            if self.collide_direction == CollideDirection.BOTTOM else
-                         random() * pi + pi
-                            if self.collide_direction == CollideDirection.TOP else
-                         random() * pi + pi / 2
-                            if self.collide_direction == CollideDirection.RIGHT else
-                         random() * pi - pi / 2
-                            if self.collide_direction == CollideDirection.LEFT else
-                         random() * 2 * pi,
+                         Vector2(pos_x, pos_y),
+                         random() * angle_range + angle_from,
                          self.shooter
             )
 
@@ -14,6 +14,9 @@ class Platform(VectoredSprite):
         """
         Initialize Platform
         """
+        # Platforms never move, so build rectangle only once
+        self._rect: pg.Rect = pg.Rect(*pos, width, config.PLATFORM_HEIGHT)
+
         super(Platform, self).__init__(Vector2(pos),
                                        Vector2(width, config.PLATFORM_HEIGHT),
                                        *groups)
@@ -21,3 +24,10 @@ class Platform(VectoredSprite):
         self.image.fill(config.PLATFORM_BG)
         pg.draw.rect(self.image, config.PLATFORM_BG,
                      self.image.get_bounding_rect(), 0)
+
+    @property
+    def rect(self) -> pg.Rect:
+        """
+        Get cached platform rectangle
+        """
+        return self._rect
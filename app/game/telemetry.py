@@ -0,0 +1,140 @@
+import gzip
+import json
+import struct
+from threading import Thread, Event
+from time import time
+
+# Event types
+SHOT = 1
+ROCKET = 2
+EXPLOSION = 3
+KILL = 4
+MATCH_END = 5
+
+EVENT_NAMES: dict[int, str] = {
+    SHOT: 'shot',
+    ROCKET: 'rocket',
+    EXPLOSION: 'explosion',
+    KILL: 'kill',
+    MATCH_END: 'match_end'
+}
+
+# Player number used when event has no player
+NO_PLAYER = 255
+
+# Fixed-size event record: time, event type, player, target player, x, y
+RECORD: struct.Struct = struct.Struct('<dBBBxff')
+
+
+class Telemetry(object):
+    """
+    Match telemetry.
+    Appends fixed-size event records to preallocated ring buffer,
+    background thread flushes them in batches
+    to gzip-compressed JSON lines file.
+    Drops events instead of blocking game loop when ring is full.
+    """
+
+    def __init__(self, path: str, capacity: int, flush_interval: float):
+        """
+        Initialize Telemetry by output file path,
+        ring capacity in events and flush interval in seconds
+        """
+        self.capacity: int = capacity
+        self.ring: bytearray = bytearray(RECORD.size * capacity)
+
+        # Count written and read events. Game loop only changes
+        # n_written and writer thread only changes n_read,
+        # so ring needs no lock
+        self.n_written: int = 0
+        self.n_read: int = 0
+        self.n_dropped: int = 0
+
+        self.file = gzip.open(path, 'wt', compresslevel=1)
+
+        self.stopped: Event = Event()
+        self.flush_interval: float = flush_interval
+        self.writer: Thread = Thread(target=self.write_loop,
+                                     name='telemetry-writer',
+                                     daemon=True)
+        self.writer.start()
+
+    def emit(self,
+             event: int,
+             player: int = NO_PLAYER,
+             target: int = NO_PLAYER,
+             x: float = 0,
+             y: float = 0):
+        """
+        Append event record to ring buffer
+        """
+        n_written: int = self.n_written
+        if n_written - self.n_read >= self.capacity:
+            self.n_dropped += 1
+            return
+
+        RECORD.pack_into(self.ring,
+                         n_written % self.capacity * RECORD.size,
+                         time(), event, player, target, x, y)
+        self.n_written = n_written + 1
+
+    def read_records(self) -> list[tuple]:
+        """
+        Read all records written since last read
+        """
+        start: int = self.n_read % self.capacity
+        n_records: int = self.n_written - self.n_read
+        end: int = start + n_records
+
+        ring: memoryview = memoryview(self.ring)
+        if end <= self.capacity:
+            chunks = [ring[start * RECORD.size:end * RECORD.size]]
+        else:
+            # Records wrap around ring end
+            chunks = [ring[start * RECORD.size:],
+                      ring[:(end - self.capacity) * RECORD.size]]
+        records: list[tuple] = [
+            record
+            for chunk in chunks
+            for record in RECORD.iter_unpack(chunk)
+        ]
+
+        # Release records slots only after they are unpacked
+        self.n_read += n_records
+        return records
+
+    def flush(self):
+        """
+        Write buffered events to file
+        """
+        records: list[tuple] = self.read_records()
+        if not records:
+            return
+
+        self.file.write(''.join(
+            json.dumps({
+                'time': event_time,
+                'event': EVENT_NAMES[event],
+                'player': None if player == NO_PLAYER else player,
+                'target': None if target == NO_PLAYER else target,
+                'x': x,
+                'y': y
+            }) + '\n'
+            for event_time, event, player, target, x, y in records
+        ))
+
+    def write_loop(self):
+        """
+        Flush events periodically until closed
+        """
+        while not self.stopped.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        """
+        Stop writer, flush events left and close file
+        """
+        self.stopped.set()
+        self.writer.join()
+        self.flush()
+        self.file.close()
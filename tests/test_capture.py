@@ -0,0 +1,85 @@
+import os
+import zlib
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame as pg
+
+from app.game.capture import FrameRecorder
+
+COLOR = (10, 20, 30)
+
+
+def make_surface() -> pg.Surface:
+    surface = pg.Surface((8, 4))
+    surface.fill(COLOR)
+    return surface
+
+
+def record(tmp_path, frame_format: str) -> FrameRecorder:
+    recorder = FrameRecorder(make_surface(), str(tmp_path), frame_format, 2, 1)
+    recorder.capture(make_surface())
+    recorder.close()
+    return recorder
+
+
+def test_raw_and_zlib_frames_are_rgb(tmp_path):
+    record(tmp_path, 'raw')
+    record(tmp_path, 'zlib')
+
+    raw = (tmp_path / 'frame_000000.rgb').read_bytes()
+    compressed = (tmp_path / 'frame_000000.rgb.z').read_bytes()
+    assert raw == bytes(COLOR) * 8 * 4
+    assert zlib.decompress(compressed) == raw
+
+
+def test_png_frame_is_readable(tmp_path):
+    record(tmp_path, 'png')
+
+    image = pg.image.load(str(tmp_path / 'frame_000000.png'))
+    assert image.get_size() == (8, 4)
+    assert image.get_at((7, 3))[:3] == COLOR
+
+
+def test_buffers_are_unlocked_when_given_back(tmp_path):
+    recorder = FrameRecorder(make_surface(), str(tmp_path), 'raw', 2, 1)
+    locked_when_given_back = []
+
+    put = recorder.free_buffers.put
+
+    def check_and_put(buffer_number: int):
+        buffer = recorder.buffers[buffer_number]
+        locked_when_given_back.append(buffer.get_locked())
+        put(buffer_number)
+
+    recorder.free_buffers.put = check_and_put
+    recorder.capture(make_surface())
+    recorder.close()
+
+    assert locked_when_given_back == [False]
+
+
+def test_failed_frames_are_counted(tmp_path):
+    recorder = FrameRecorder(make_surface(), str(tmp_path / 'frames'),
+                             'raw', 2, 1)
+    # Make writer fail to open frame file
+    os.rmdir(tmp_path / 'frames')
+
+    recorder.capture(make_surface())
+    recorder.close()
+
+    assert recorder.n_failed == 1
+    assert recorder.free_buffers.qsize() == 2
+
+
+def test_failures_of_concurrent_writers_are_all_counted(tmp_path):
+    recorder = FrameRecorder(make_surface(), str(tmp_path / 'frames'),
+                             'raw', 64, 8)
+    os.rmdir(tmp_path / 'frames')
+
+    for i in range(64):
+        recorder.capture(make_surface())
+    recorder.close()
+
+    assert recorder.n_dropped == 0
+    assert recorder.n_failed == 64
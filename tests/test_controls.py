@@ -0,0 +1,21 @@
+import pytest
+
+from app.game.controls import ScriptedInput, JUMP, SHOOT
+
+
+def test_scripted_input_fills_controls_in_place():
+    controls = [0, 0, 0]
+    shared = controls
+
+    ScriptedInput(lambda tick: [JUMP, 0, SHOOT]).sample(controls)
+
+    assert shared is controls
+    assert controls == [JUMP, 0, SHOOT]
+
+
+def test_scripted_input_rejects_wrong_players_count():
+    controls = [0, 0, 0]
+
+    with pytest.raises(ValueError):
+        ScriptedInput(lambda tick: [JUMP]).sample(controls)
+    assert controls == [0, 0, 0]
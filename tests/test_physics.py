@@ -0,0 +1,85 @@
+import os
+import tracemalloc
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from pygame.math import Vector2
+
+from app.game import Game
+from app import config
+from app.game.objects import MaterialObject, CollideDirection
+from app.game.platform import Platform
+
+N_TICKS = 1000
+
+
+def allocated_per_ticks(update) -> int:
+    """
+    Get peak memory allocated while running update for N_TICKS times,
+    excluding memory allocated by measuring loop itself
+    """
+    def peak_memory(function) -> int:
+        # Warm up caches before measuring
+        for i in range(N_TICKS):
+            function()
+
+        tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            for i in range(N_TICKS):
+                function()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return peak - before
+
+    return peak_memory(update) - peak_memory(lambda: None)
+
+
+def test_resting_object_does_not_allocate():
+    game = Game()
+    material_object = MaterialObject(
+        game, Vector2(5, config.GAME_SIZE.y - 5), Vector2(5, 5), 500
+    )
+    material_object.collide_direction = CollideDirection.BOTTOM
+
+    def update():
+        # Object lies on the floor
+        material_object.last_tick -= 1 / config.UPS
+        material_object.update()
+        assert material_object.collide_direction == CollideDirection.BOTTOM
+
+    assert allocated_per_ticks(update) == 0
+
+
+def test_moving_object_does_not_allocate():
+    game = Game()
+    material_object = MaterialObject(game, Vector2(5, 5), Vector2(5, 5), 0)
+
+    def update():
+        # Keep object flying above map without collisions
+        material_object.pos.x = 300.0
+        material_object.pos.y = 30.0
+        material_object.speed.x = 100.0
+        material_object.speed.y = 50.0
+        material_object.update()
+        assert material_object.collide_direction is None
+
+    assert allocated_per_ticks(update) == 0
+
+
+def test_physics_uses_changed_platforms():
+    game = Game()
+    platform = Platform(Vector2(0, 100), 100)
+    game.set_platforms([platform])
+    assert game.platforms_tuple == (platform,)
+
+    material_object = MaterialObject(game, Vector2(10, 93), Vector2(5, 5), 0)
+    material_object.speed.y = 1000
+    material_object.last_tick -= 1 / config.UPS
+    material_object.update()
+
+    assert material_object.collide_direction == CollideDirection.BOTTOM
+    assert material_object.pos.y == 100 - 5
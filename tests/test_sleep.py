@@ -0,0 +1,81 @@
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pytest
+from pygame.math import Vector2
+
+from app.game import Game, controls, objects
+from app.game.objects import FireParticle
+from app.game.platform import Platform
+from app import config
+
+
+@pytest.fixture
+def clock(monkeypatch) -> list[float]:
+    clock = [1000.0]
+    monkeypatch.setattr(objects, 'time', lambda: clock[0])
+    return clock
+
+
+def make_game(clock, pressed: list[int]) -> Game:
+    """
+    Make game with given controls pressed by every player
+    and let players fall asleep on platforms
+    """
+    game = Game(controls.ScriptedInput(
+        lambda tick: [pressed[0]] * config.N_PLAYERS
+    ))
+    for i in range(config.UPS * 2):
+        tick(game, clock)
+    return game
+
+
+def tick(game: Game, clock: list[float]):
+    clock[0] += 1 / config.UPS
+    game.input_source.sample(game.controls)
+    game.update()
+
+
+def first_player(game: Game) -> objects.Player:
+    return min(game.players, key=lambda player: player.number)
+
+
+def test_idle_player_sleeps_and_jumps_at_once(clock):
+    pressed = [0]
+    game = make_game(clock, pressed)
+    player = first_player(game)
+    assert player.is_sleeping
+
+    pressed[0] = controls.JUMP
+    tick(game, clock)
+    assert not player.is_sleeping
+    assert player.speed.y < 0
+
+
+def test_near_projectile_wakes_sleeping_player(clock):
+    game = make_game(clock, [0])
+    player = first_player(game)
+    far_player = max(game.players, key=lambda player: player.number)
+    assert player.is_sleeping and far_player.is_sleeping
+
+    # Particle of another player appears right above the player
+    FireParticle(game,
+                 player.pos + Vector2(0, -config.WAKE_DISTANCE / 2),
+                 0,
+                 far_player)
+    tick(game, clock)
+
+    assert player.alive()
+    assert not player.is_sleeping
+    assert far_player.is_sleeping
+
+
+def test_platforms_change_wakes_sleeping_objects(clock):
+    game = make_game(clock, [0])
+    assert not game.awake_objects
+
+    game.set_platforms([Platform(Vector2(0, 0), config.MAP_CELL.x)])
+
+    assert not game.sleeping_objects
+    assert set(game.awake_objects) == set(game.players)
@@ -0,0 +1,112 @@
+import gzip
+import json
+import os
+from time import perf_counter
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from app.game import Game
+from app.game.objects import Bullet
+from app.game import telemetry
+from app.game.telemetry import Telemetry
+from app import config
+
+# Upper bound of emit cost, generous to not fail on slow machines
+MAX_EMIT_SECONDS = 20e-6
+
+
+def read_events(path) -> list[dict]:
+    with gzip.open(path, 'rt') as events_file:
+        return [json.loads(line) for line in events_file]
+
+
+def test_kills_and_match_end_are_emitted_in_order(tmp_path, monkeypatch):
+    path = tmp_path / 'events.jsonl.gz'
+    monkeypatch.setattr(config, 'TELEMETRY_FILE', str(path))
+    game = Game()
+    shooter, *victims = sorted(game.players, key=lambda player: player.number)
+
+    for victim in victims:
+        # Victim's own bullet explodes when victim is killed
+        victim.shoot()
+        Bullet(game, shooter).on_collide_player(victim)
+
+    # Match end is found by update, no frame is needed
+    game.update()
+    game.telemetry.close()
+
+    events = [(event['event'], event['player'])
+              for event in read_events(path)]
+    expected = []
+    for victim in victims:
+        expected += [('shot', victim.number),
+                     ('kill', shooter.number),
+                     ('explosion', victim.number)]
+    expected.append(('match_end', shooter.number))
+    assert events == expected
+
+
+def test_exploded_bombs_are_not_emitted_again_on_kill(tmp_path, monkeypatch):
+    path = tmp_path / 'events.jsonl.gz'
+    monkeypatch.setattr(config, 'TELEMETRY_FILE', str(path))
+    game = Game()
+    shooter, victim, *_ = sorted(game.players,
+                                 key=lambda player: player.number)
+
+    # Victim's bullet explodes before victim is killed
+    victim.shoot()
+    victim.bombs[-1].kill()
+    Bullet(game, shooter).on_collide_player(victim)
+    game.telemetry.close()
+
+    events = [(event['event'], event['player'])
+              for event in read_events(path)]
+    assert events == [('shot', victim.number),
+                      ('explosion', victim.number),
+                      ('kill', shooter.number)]
+
+
+def test_records_wrapping_around_ring_are_read_in_order(tmp_path):
+    path = tmp_path / 'events.jsonl.gz'
+    events = Telemetry(str(path), 4, 60)
+
+    for player in range(3):
+        events.emit(telemetry.SHOT, player)
+    events.flush()
+    # These records go past ring end
+    for player in range(3, 6):
+        events.emit(telemetry.KILL, player, player + 1)
+    events.close()
+
+    assert [(event['event'], event['player'], event['target'])
+            for event in read_events(path)] == [
+        ('shot', 0, None), ('shot', 1, None), ('shot', 2, None),
+        ('kill', 3, 4), ('kill', 4, 5), ('kill', 5, 6)
+    ]
+    assert events.n_dropped == 0
+
+
+def test_events_are_dropped_when_ring_is_full(tmp_path):
+    path = tmp_path / 'events.jsonl.gz'
+    events = Telemetry(str(path), 4, 60)
+
+    for player in range(6):
+        events.emit(telemetry.SHOT, player)
+    events.close()
+
+    assert events.n_dropped == 2
+    assert [event['player'] for event in read_events(path)] == [0, 1, 2, 3]
+
+
+def test_emit_cost_is_bounded(tmp_path):
+    n_events = 10000
+    events = Telemetry(str(tmp_path / 'events.jsonl.gz'), n_events, 60)
+
+    start = perf_counter()
+    for i in range(n_events):
+        events.emit(telemetry.SHOT, 0, 1, 1.5, 2.5)
+    cost = (perf_counter() - start) / n_events
+    events.close()
+
+    assert events.n_dropped == 0
+    assert cost < MAX_EMIT_SECONDS